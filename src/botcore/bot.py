@@ -1,7 +1,11 @@
+import asyncio
+import aiohttp
+from concurrent.futures import ThreadPoolExecutor
 from discord.ext import commands
 from discord import Intents
 from botcore.loader import load_all_cogs, maybe_start_watcher
 from botcore.event_filter import should_ignore_event
+from config.manager import get_config
 
 
 class MyBot(commands.Bot):
@@ -9,12 +13,32 @@ class MyBot(commands.Bot):
         intents = kwargs.pop("intents", Intents.default())
         intents.message_content = True
         super().__init__(*args, intents=intents, **kwargs)
+        self._blocking_pool: ThreadPoolExecutor | None = None
+        self.http_session: aiohttp.ClientSession | None = None
 
     async def setup_hook(self):
-        """Load cogs and start the dev watcher if needed."""
+        """Set up shared resources, load cogs and start the dev watcher if needed."""
+        self._blocking_pool = ThreadPoolExecutor(
+            max_workers=get_config().thread_pool_size,
+            thread_name_prefix="bot-io",
+        )
+        asyncio.get_running_loop().set_default_executor(self._blocking_pool)
+
+        # Shared keep-alive HTTP pool for cogs talking to public APIs
+        self.http_session = aiohttp.ClientSession()
+
         await load_all_cogs(self)
         maybe_start_watcher(self)
 
+    async def close(self):
+        await super().close()
+        if self.http_session is not None:
+            await self.http_session.close()
+            self.http_session = None
+        if self._blocking_pool is not None:
+            self._blocking_pool.shutdown(wait=False, cancel_futures=True)
+            self._blocking_pool = None
+
     async def _run_event(self, coro, event_name, *args, **kwargs):
         """Universal event filter that ignores tester channel in prod."""
         if should_ignore_event(event_name, args):
@@ -1,23 +1,40 @@
-from config.manager import ConfigManager
+from functools import cache
+
+from config.manager import get_config
+
+_FILTERED_EVENTS = frozenset(
+    {
+        "on_reaction_add",
+        "on_reaction_remove",
+        "on_message_edit",
+        "on_typing",
+    }
+)
+
+
+@cache
+def _ignored_channel_id() -> int | None:
+    """
+    Returns the tester channel ID to ignore, or None when nothing should be filtered.
+    Resolved once on first use; config does not change during a run.
+    """
+    config = get_config()
+    if config.app_env != "prod":
+        return None
+    return config.tester_channel_id
 
 
 def should_ignore_event(event_name: str, args: tuple) -> bool:
     """
     Returns True if the event should be ignored (e.g., messages in tester channel when in prod).
     """
-    config = ConfigManager()
-
-    if config.get_app_env() != "prod":
+    ignored_channel_id = _ignored_channel_id()
+    if ignored_channel_id is None:
         return False
 
-    if event_name.startswith("on_message") or event_name in {
-        "on_reaction_add",
-        "on_reaction_remove",
-        "on_message_edit",
-        "on_typing",
-    }:
+    if event_name.startswith("on_message") or event_name in _FILTERED_EVENTS:
         message = args[0] if args else None
-        if message and message.channel.id == config.get_tester_channel_id():
+        if message and message.channel.id == ignored_channel_id:
             return True
 
     return False
@@ -1,26 +1,37 @@
+import asyncio
+import logging
 from pathlib import Path
-from config.manager import ConfigManager
+from config.manager import get_config
 from reloader.watcher import start_watcher
 
+log = logging.getLogger(__name__)
+
 
 async def load_all_cogs(bot):
-    """Load all cogs from the cogs directory."""
+    """Load all cogs from the cogs directory concurrently."""
     cogs_folder = Path(__file__).parent.parent / "cogs"
-    print("Loading cogs...")
+    log.info("Loading cogs...")
+
+    cog_files = [
+        file_path
+        for file_path in cogs_folder.glob("*.py")
+        if not file_path.name.startswith("__")
+    ]
+    results = await asyncio.gather(
+        *(bot.load_extension(f"cogs.{file_path.stem}") for file_path in cog_files),
+        return_exceptions=True,
+    )
 
-    for file_path in cogs_folder.glob("*.py"):
-        if not file_path.name.startswith("__"):
-            try:
-                await bot.load_extension(f"cogs.{file_path.stem}")
-                print(f"Loaded cog: {file_path.name}")
-            except Exception as e:
-                print(f"Failed to load {file_path.name}: {e}")
+    for file_path, result in zip(cog_files, results):
+        if isinstance(result, Exception):
+            log.error("Failed to load %s: %s", file_path.name, result)
+        else:
+            log.info("Loaded cog: %s", file_path.name)
 
-    print("Cogs loaded successfully.")
+    log.info("Cogs loaded successfully.")
 
 
 def maybe_start_watcher(bot):
     """Start hot-reload watcher in development mode."""
-    config = ConfigManager()
-    if config.get_app_env() == "dev":
+    if get_config().app_env == "dev":
         start_watcher(bot)
@@ -1,15 +1,30 @@
+import logging
 import re
 from discord.ext import commands
 from discord import Message
-from services.litellm_service import LiteLLMService
+from services.litellm_service import LiteLLMService, ERROR_PREFIX
 from langchain_core.prompts import ChatPromptTemplate
 
+log = logging.getLogger(__name__)
+
+_ARABIC_SEARCH = re.compile(r"[\u0600-\u06FF]").search
+# Only the head of a message is scanned; Arabic chat shows up well within it
+_SCAN_LIMIT = 512
+
 
 class AutoTranslationCog(commands.Cog, name="ArabicTranslate"):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
         self.llm_service = LiteLLMService()
-        self.arabic_pattern = re.compile(r"[\u0600-\u06FF]")
+
+        # Literal command prefixes, resolved once; callable prefixes can't be checked here
+        prefix = bot.command_prefix
+        if isinstance(prefix, str):
+            self._prefixes: tuple[str, ...] = (prefix,)
+        elif isinstance(prefix, (list, tuple)):
+            self._prefixes = tuple(prefix)
+        else:
+            self._prefixes = ()
 
         self.prompt = ChatPromptTemplate.from_messages(
             [
@@ -24,11 +39,13 @@ class AutoTranslationCog(commands.Cog, name="ArabicTranslate"):
     @commands.Cog.listener()
     async def on_message(self, message: Message):
         """Hook into on_message to auto-translate Arabic text."""
-        if message.author.bot or message.content.startswith(self.bot.command_prefix):  # type: ignore
+        if message.author.bot or (
+            self._prefixes and message.content.startswith(self._prefixes)
+        ):
             return
 
-        if self.arabic_pattern.search(message.content):
-            prompt_value = await self.prompt.ainvoke({"text": message.content})
+        if _ARABIC_SEARCH(message.content, 0, _SCAN_LIMIT):
+            prompt_value = await self.prompt.aformat_prompt(text=message.content)
             translated_text = None
             prefix = "🌍 Translation:\n"
             warning_msg = None
@@ -40,9 +57,10 @@ class AutoTranslationCog(commands.Cog, name="ArabicTranslate"):
                         self.llm_service.primary_llm,
                         prompt_value,
                         prefix=prefix,
+                        use_cache=True,
                     )
                 except Exception as e:
-                    print(f"ArabicTranslateFeature: API Error: {e}")
+                    log.warning("API Error: %s", e)
                     warning_msg = await message.reply(
                         "⚠️ **Translation API failed.** Falling back to local `llama3.2`. This may take a moment...",
                         mention_author=False,
@@ -53,21 +71,22 @@ class AutoTranslationCog(commands.Cog, name="ArabicTranslate"):
                             self.llm_service.fallback_llm,
                             prompt_value,
                             prefix=prefix,
+                            use_cache=True,
                         )
                     except Exception as fallback_e:
-                        print(f"ArabicTranslateFeature: Fallback error: {fallback_e}")
+                        log.error("Fallback error: %s", fallback_e)
                         return
                     finally:
                         if warning_msg:
                             try:
                                 await warning_msg.delete()
                             except Exception as delete_e:
-                                print(
-                                    f"ArabicTranslateFeature: Failed to delete warning message: {delete_e}"
+                                log.warning(
+                                    "Failed to delete warning message: %s", delete_e
                                 )
 
-            if not translated_text or translated_text.startswith("Sorry,"):
-                print("Translation failed")
+            if not translated_text or translated_text.startswith(ERROR_PREFIX):
+                log.debug("Translation failed")
                 return
 
 
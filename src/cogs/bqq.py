@@ -1,6 +1,14 @@
+import logging
+import re
 from discord.ext import commands
 from discord import Message
 
+log = logging.getLogger(__name__)
+
+_NEEDLE = "no bqq"
+# Case-insensitive search in C, without building a lowercased copy of the message
+_NO_BQQ_SEARCH = re.compile(re.escape(_NEEDLE), re.IGNORECASE).search
+
 
 class BqqCog(commands.Cog, name="NoBqq"):
     def __init__(self, bot: commands.Bot):
@@ -13,11 +21,19 @@ class BqqCog(commands.Cog, name="NoBqq"):
         if message.author == self.bot.user:
             return
 
-        if "no bqq" in message.content.lower():
+        content = message.content
+        # Too short to contain the phrase
+        if len(content) < len(_NEEDLE):
+            return
+        # No 'b' at all means no match; plain substring scans are cheaper than the regex
+        if "b" not in content and "B" not in content:
+            return
+
+        if _NO_BQQ_SEARCH(content) is not None:
             try:
                 await message.channel.send(self.gif_url)
             except Exception as e:
-                print(f"BQQ Feature: Error sending GIF response: {e}")
+                log.warning("Error sending GIF response: %s", e)
 
 
 async def setup(bot: commands.Bot):
@@ -1,9 +1,45 @@
+import asyncio
+import contextlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+import discord
 from discord.ext import commands
 from discord import Message
-from collections import OrderedDict
-from services.litellm_service import LiteLLMService
+from collections import OrderedDict, deque
+from pathlib import Path
+from services.litellm_service import LiteLLMService, ERROR_PREFIX
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain_core.chat_history import InMemoryChatMessageHistory
+from langchain_core.messages import messages_from_dict, messages_to_dict
+
+log = logging.getLogger(__name__)
+
+# Fast answers show up before this many seconds, so typing is only shown after it
+_TYPING_DELAY = 1.5
+# Conversations are mirrored here so replies keep their context across restarts
+DB_FILE = Path(__file__).parent.parent / "data" / "gemini_conversations.db"
+
+
+@contextlib.asynccontextmanager
+async def _typing_after(ctx: commands.Context, delay: float):
+    """Shows the typing indicator only if the body is still running after `delay` seconds."""
+
+    async def _delayed_typing():
+        await asyncio.sleep(delay)
+        try:
+            async with ctx.typing():
+                await asyncio.Event().wait()  # Held until cancelled below
+        except discord.HTTPException as e:
+            log.debug("Failed to show typing indicator: %s", e)
+
+    typing_task = asyncio.create_task(_delayed_typing())
+    try:
+        yield
+    finally:
+        typing_task.cancel()
 
 
 class GeminiCog(commands.Cog, name="Gemini"):
@@ -13,6 +49,11 @@ class GeminiCog(commands.Cog, name="Gemini"):
         self.conversations: OrderedDict[int, InMemoryChatMessageHistory] = OrderedDict()
         self.MAX_ACTIVE_CONVERSATIONS = 50
         self.MAX_CONVERSATION_HISTORY_MESSAGES = 50
+        self._message_cache: OrderedDict[int, Message] = OrderedDict()
+        self.MAX_CACHED_MESSAGES = 512
+        # Every query runs in a worker thread; the lock keeps them off the connection at the same time
+        self._db_lock = threading.Lock()
+        self._conv_db: sqlite3.Connection | None = None  # Opened in cog_load
 
         self.prompt = ChatPromptTemplate.from_messages(
             [
@@ -22,31 +63,153 @@ class GeminiCog(commands.Cog, name="Gemini"):
             ]
         )
 
-    def _cleanup_old_conversations(self):
-        """Removes the oldest conversation histories if exceeding MAX_ACTIVE_CONVERSATIONS."""
-        while len(self.conversations) > self.MAX_ACTIVE_CONVERSATIONS:
+    async def cog_load(self):
+        self._conv_db = await asyncio.to_thread(self._open_conversation_db)
+
+    async def cog_unload(self):
+        if self._conv_db is not None:
+            await asyncio.to_thread(self._close_conversation_db)
+
+    @staticmethod
+    def _open_conversation_db() -> sqlite3.Connection | None:
+        """Opens the on-disk conversation store, or returns None to run memory-only."""
+        try:
+            DB_FILE.parent.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(DB_FILE, isolation_level=None, check_same_thread=False)
+            # WAL with NORMAL sync skips the per-commit fsync that stalls SD-card hosts
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS conv (id INTEGER PRIMARY KEY, ts INTEGER, messages TEXT)"
+            )
+            return db
+        except sqlite3.Error as e:
+            log.warning("Conversation store unavailable, keeping memory only: %s", e)
+            return None
+
+    def _close_conversation_db(self):
+        with self._db_lock:
+            if self._conv_db is not None:
+                self._conv_db.close()
+                # Late lookups and stores fall back to memory-only
+                self._conv_db = None
+
+    def _read_conversation_row(self, message_id: int) -> str | None:
+        """Blocking; run via asyncio.to_thread."""
+        with self._db_lock:
+            if self._conv_db is None:
+                return None
+            row = self._conv_db.execute(
+                "SELECT messages FROM conv WHERE id = ?", (message_id,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def _write_conversation_row(self, message_id: int, payload: str):
+        """Blocking; run via asyncio.to_thread. Upserts and prunes in one transaction."""
+        with self._db_lock:
+            db = self._conv_db
+            if db is None:
+                return
+            db.execute("BEGIN")
+            try:
+                db.execute(
+                    "INSERT OR REPLACE INTO conv (id, ts, messages) VALUES (?, ?, ?)",
+                    (message_id, int(time.time()), payload),
+                )
+                db.execute(
+                    "DELETE FROM conv WHERE id NOT IN (SELECT id FROM conv ORDER BY ts DESC, id DESC LIMIT ?)",
+                    (self.MAX_ACTIVE_CONVERSATIONS,),
+                )
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+            db.execute("COMMIT")
+
+    async def _get_conversation(
+        self, message_id: int
+    ) -> InMemoryChatMessageHistory | None:
+        """Looks a conversation up in memory first, then in the on-disk store."""
+        history = self.conversations.get(message_id)
+        if history is not None:
+            self.conversations.move_to_end(message_id)
+            return history
+        if self._conv_db is None:
+            return None
+
+        try:
+            payload = await asyncio.to_thread(self._read_conversation_row, message_id)
+        except sqlite3.Error as e:
+            log.warning("Failed to read conversation %s: %s", message_id, e)
+            return None
+        if payload is None:
+            return None
+
+        try:
+            history = InMemoryChatMessageHistory(
+                messages=messages_from_dict(json.loads(payload))
+            )
+        except (ValueError, KeyError, TypeError) as e:
+            # A malformed row is treated as a miss; the reply chain walk rebuilds it
+            log.warning("Ignoring unreadable conversation %s: %s", message_id, e)
+            return None
+        self.conversations[message_id] = history
+        if len(self.conversations) > self.MAX_ACTIVE_CONVERSATIONS:
             self.conversations.popitem(last=False)
+        return history
+
+    async def _store_conversation(
+        self, message_id: int, history: InMemoryChatMessageHistory
+    ):
+        """Stores a conversation as most recent, evicting the oldest past MAX_ACTIVE_CONVERSATIONS."""
+        conversations = self.conversations
+        conversations.pop(message_id, None)
+        conversations[message_id] = history
+        if len(conversations) > self.MAX_ACTIVE_CONVERSATIONS:
+            conversations.popitem(last=False)
+
+        if self._conv_db is None:
+            return
+        # Serialized here so the worker thread never touches the live message list
+        payload = json.dumps(messages_to_dict(history.messages))
+        try:
+            await asyncio.to_thread(self._write_conversation_row, message_id, payload)
+        except sqlite3.Error as e:
+            log.warning("Failed to persist conversation %s: %s", message_id, e)
+
+    async def _get_message(self, channel, message_id: int) -> Message:
+        """Fetches a message, serving repeat lookups from a bounded LRU cache."""
+        message = self._message_cache.get(message_id)
+        if message is not None:
+            self._message_cache.move_to_end(message_id)
+            return message
+
+        message = await channel.fetch_message(message_id)
+        self._message_cache[message_id] = message
+        if len(self._message_cache) > self.MAX_CACHED_MESSAGES:
+            self._message_cache.popitem(last=False)
+        return message
 
     @commands.command(name="ask", aliases=["gemini", "miku"])
     async def gemini_command(self, ctx: commands.Context, *, prompt: str):
         """Talk to the Gemini AI. Reply to the bot's previous messages to continue a conversation."""
-        if not prompt:
-            await ctx.reply("Please provide a prompt for Gemini!")
-            return
-
         user_current_prompt_text = prompt
+        # Plain int comparisons for the author checks below
+        bot_user_id = self.bot.user.id
         current_history = InMemoryChatMessageHistory()
         cache_loaded = False
+        checked_id = None  # Conversation id already looked up (and missed) in step 1
 
         # 1. Check if replying to the bot's known conversation in memory
         if ctx.message.reference and ctx.message.reference.resolved:
             replied_message: Message = ctx.message.reference.resolved  # type: ignore
-            if replied_message.author == self.bot.user:
-                retrieved_history = self.conversations.get(replied_message.id)
+            if replied_message.author.id == bot_user_id:
+                checked_id = replied_message.id
+                retrieved_history = await self._get_conversation(checked_id)
                 if retrieved_history:
-                    # Shallow copy the message list to branch off seamlessly
-                    current_history.messages = list(retrieved_history.messages)
-                    self.conversations.move_to_end(replied_message.id)
+                    # Shallow copy (already trimmed) of the message list to branch off seamlessly
+                    current_history.messages = retrieved_history.messages[
+                        -self.MAX_CONVERSATION_HISTORY_MESSAGES :
+                    ]
                     cache_loaded = True
 
         # 2. If no cache was loaded but there's a reply chain (e.g. bot restarted, or replying to human),
@@ -56,27 +219,42 @@ class GeminiCog(commands.Cog, name="Gemini"):
             and ctx.message.reference
             and ctx.message.reference.message_id
         ):
-            thread_msgs = []
-            curr_msg_id = ctx.message.reference.message_id
+            # Oldest message ends up first, so no reversal is needed afterwards
+            thread_msgs: deque[Message] = deque()
+            curr_ref = ctx.message.reference
 
             # Traverse up the reply chain (limit to 10 to avoid hitting Discord rate limits)
             for _ in range(10):
+                curr_msg_id = curr_ref.message_id if curr_ref else None
                 if not curr_msg_id:
                     break
-                try:
-                    curr_msg = await ctx.channel.fetch_message(curr_msg_id)
-                    thread_msgs.append(curr_msg)
-                    if curr_msg.reference and curr_msg.reference.message_id:
-                        curr_msg_id = curr_msg.reference.message_id
-                    else:
+
+                # A bot reply we still remember already carries everything above it.
+                # Only bot replies are stored, so known human messages skip the lookup.
+                curr_msg = curr_ref.resolved
+                if curr_msg_id != checked_id and not (
+                    isinstance(curr_msg, Message) and curr_msg.author.id != bot_user_id
+                ):
+                    known_history = await self._get_conversation(curr_msg_id)
+                    if known_history:
+                        current_history.messages = known_history.messages[
+                            -self.MAX_CONVERSATION_HISTORY_MESSAGES :
+                        ]
                         break
+
+                try:
+                    # Discord embeds the replied-to message in most payloads; fetch only when it didn't
+                    if not isinstance(curr_msg, Message):
+                        curr_msg = await self._get_message(ctx.channel, curr_msg_id)
+                    thread_msgs.appendleft(curr_msg)
+                    curr_ref = curr_msg.reference
                 except Exception as e:
-                    print(f"GeminiCog: Failed to fetch thread message: {e}")
+                    log.warning("Failed to fetch thread message: %s", e)
                     break
 
             # Add the fetched messages chronologically to LangChain history
-            for msg in reversed(thread_msgs):
-                if msg.author == self.bot.user:
+            for msg in thread_msgs:
+                if msg.author.id == bot_user_id:
                     current_history.add_ai_message(msg.content)
                 else:
                     # Prefix human messages with their name so the bot knows who said what
@@ -84,19 +262,17 @@ class GeminiCog(commands.Cog, name="Gemini"):
                         f"{msg.author.display_name}: {msg.content}"
                     )
 
-        # Truncate history to save tokens
+        # Truncate history to save tokens (in place; the list is already our own copy)
         if len(current_history.messages) > self.MAX_CONVERSATION_HISTORY_MESSAGES:
-            current_history.messages = current_history.messages[
-                -self.MAX_CONVERSATION_HISTORY_MESSAGES :
-            ]
+            del current_history.messages[: -self.MAX_CONVERSATION_HISTORY_MESSAGES]
 
         # Format the final prompt value to inject into the LLM
-        prompt_value = await self.prompt.ainvoke(
-            {"history": current_history.messages, "question": user_current_prompt_text}
+        prompt_value = await self.prompt.aformat_prompt(
+            history=current_history.messages, question=user_current_prompt_text
         )
 
         warning_msg = None
-        async with ctx.typing():
+        async with _typing_after(ctx, _TYPING_DELAY):
             try:
                 # Stream via Native async LangChain invoke
                 (
@@ -105,11 +281,19 @@ class GeminiCog(commands.Cog, name="Gemini"):
                 ) = await self.llm_service.stream_to_discord(
                     ctx.message, self.llm_service.primary_llm, prompt_value
                 )
+            except discord.HTTPException as e:
+                # Discord rejected the send (rate limit, permissions); falling back and
+                # replying again would only add to the pressure, so stop here.
+                log.warning("Failed to send Gemini response: %s", e)
+                return
             except Exception as e:
-                print(f"Gemini API Error: {e}")
-                warning_msg = await ctx.reply(
-                    "⚠️ **Gemini API failed.** Falling back to local `llama3.2` model. This runs locally on the Raspberry Pi and may take a moment..."
-                )
+                log.warning("Gemini API Error: %s", e)
+                try:
+                    warning_msg = await ctx.reply(
+                        "⚠️ **Gemini API failed.** Falling back to local `llama3.2` model. This runs locally on the Raspberry Pi and may take a moment..."
+                    )
+                except discord.HTTPException as reply_e:
+                    log.warning("Failed to send fallback warning: %s", reply_e)
                 try:
                     # Async local fallback stream invoke
                     (
@@ -118,17 +302,24 @@ class GeminiCog(commands.Cog, name="Gemini"):
                     ) = await self.llm_service.stream_to_discord(
                         ctx.message, self.llm_service.fallback_llm, prompt_value
                     )
+                except discord.HTTPException as fallback_e:
+                    log.warning("Failed to send fallback response: %s", fallback_e)
+                    return
                 except Exception as fallback_e:
-                    print(f"Local Fallback Error: {fallback_e}")
+                    log.error("Local Fallback Error: %s", fallback_e)
                     raw_ai_response_text = "Sorry, an unknown error occurred and no response was generated from the AI."
-                    sent_discord_messages = [await ctx.reply(raw_ai_response_text)]
+                    sent_discord_messages = []
+                    try:
+                        sent_discord_messages = [await ctx.reply(raw_ai_response_text)]
+                    except discord.HTTPException as reply_e:
+                        log.warning("Failed to send error reply: %s", reply_e)
                 finally:
                     if warning_msg:
                         try:
                             await warning_msg.delete()
                         except Exception as delete_e:
-                            print(
-                                f"Gemini API: Failed to delete warning message: {delete_e}"
+                            log.warning(
+                                "Failed to delete warning message: %s", delete_e
                             )
 
         if not raw_ai_response_text:
@@ -137,7 +328,7 @@ class GeminiCog(commands.Cog, name="Gemini"):
             )
             return
 
-        is_error_response = raw_ai_response_text.startswith("Sorry,")
+        is_error_response = raw_ai_response_text.startswith(ERROR_PREFIX)
 
         # Update and map memory to the final message ID
         if sent_discord_messages and not is_error_response:
@@ -146,8 +337,16 @@ class GeminiCog(commands.Cog, name="Gemini"):
             current_history.add_user_message(user_current_prompt_text)
             current_history.add_ai_message(raw_ai_response_text)
 
-            self.conversations[final_sent_message_id] = current_history
-            self._cleanup_old_conversations()
+            await self._store_conversation(final_sent_message_id, current_history)
+
+    @gemini_command.error
+    async def gemini_command_error(self, ctx: commands.Context, error):
+        # discord.py strips the rest argument, so a blank or whitespace-only prompt ends up here
+        if isinstance(error, commands.MissingRequiredArgument):
+            await ctx.reply("Please provide a prompt for Gemini!")
+            return
+        # Having a local handler suppresses the default traceback, so keep it visible
+        log.error("Error in ask command: %s", error, exc_info=error)
 
 
 async def setup(bot: commands.Bot):
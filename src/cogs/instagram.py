@@ -4,14 +4,16 @@ import discord
 from discord.ext import commands
 from discord import Message
 
+# Matches standard IG post/reel/tv URLs, ignoring trailing query params like ?igsh=...
+# Compiled once at import; bound so each message skips the pattern attribute lookup
+_INSTAGRAM_FINDALL = re.compile(
+    r"(?:https?://)?(?:www\.)?instagram\.com/(?:p|reel|tv|reels)/[a-zA-Z0-9_-]+"
+).findall
+
 
 class InstagramCog(commands.Cog, name="Instagram"):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
-        # Matches standard IG post/reel/tv URLs, ignoring trailing query params like ?igsh=...
-        self.pattern = re.compile(
-            r"(?:https?://)?(?:www\.)?instagram\.com/(?:p|reel|tv|reels)/[a-zA-Z0-9_-]+"
-        )
 
     @commands.Cog.listener()
     async def on_message(self, message: Message):
@@ -23,7 +25,12 @@ class InstagramCog(commands.Cog, name="Instagram"):
         if message.content.startswith(self.bot.command_prefix):  # type: ignore
             return
 
-        matches = self.pattern.findall(message.content)
+        content = message.content
+        # Almost no message is an Instagram link; a substring scan rejects them before the regex
+        if "instagram.com/" not in content:
+            return
+
+        matches = _INSTAGRAM_FINDALL(content)
         if not matches:
             return
 
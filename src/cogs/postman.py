@@ -8,6 +8,15 @@ import aiohttp
 from discord.ext import commands
 from discord import Embed
 
+# Characters of response body that fit in the reply embed
+_DISPLAY_LIMIT = 3800
+# Worst case 4 bytes per UTF-8 character, plus one byte to detect overflow
+_MAX_READ_BYTES = _DISPLAY_LIMIT * 4 + 1
+
+_KEYWORD_LITERALS = {"null": None, "true": True, "false": False}
+# First characters of values worth handing to json.loads / ast.literal_eval
+_LITERAL_STARTS = frozenset("-+.0123456789[{(\"'")
+
 
 def is_ip_safe(ip_str: str) -> bool:
     try:
@@ -61,15 +70,32 @@ class SafeResolver(aiohttp.abc.AbstractResolver):
 class PostmanCog(commands.Cog, name="Postman"):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
+        self._session: aiohttp.ClientSession | None = None
+
+    async def cog_load(self):
+        # One pooled session for all requests; SafeResolver vets every new connection.
+        # Cookies are dropped so one user's responses never leak into another's requests.
+        self._session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(resolver=SafeResolver()),
+            timeout=aiohttp.ClientTimeout(total=10.0),
+            cookie_jar=aiohttp.DummyCookieJar(),
+        )
+
+    async def cog_unload(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
 
     def _parse_value(self, val):
         val = val.strip()
-        if val.lower() == "null":
+        lowered = val.lower()
+        if lowered in _KEYWORD_LITERALS:
+            return _KEYWORD_LITERALS[lowered]
+        if val == "None":
             return None
-        if val.lower() == "true":
-            return True
-        if val.lower() == "false":
-            return False
+        # Bare words can't parse as literals; skip both parsers and their exceptions
+        if not val or val[0] not in _LITERAL_STARTS:
+            return val
         try:
             return json.loads(val)
         except json.JSONDecodeError:
@@ -115,46 +141,44 @@ class PostmanCog(commands.Cog, name="Postman"):
         except ValueError:
             pass
 
-        connector = aiohttp.TCPConnector(resolver=SafeResolver())
-        timeout = aiohttp.ClientTimeout(total=10.0)
-
         try:
-            async with aiohttp.ClientSession(
-                connector=connector, timeout=timeout
-            ) as session:
-                method = req_type.upper()
-
-                req_kwargs = {
-                    "headers": headers,
-                    "allow_redirects": False,
-                }  # Block redirects for SSRF safety
-                if method in ("GET", "HEAD", "DELETE"):
-                    req_kwargs["params"] = payload
-                else:
-                    req_kwargs["json"] = payload
-
-                async with session.request(method, endpoint, **req_kwargs) as resp:
-                    chunk = await resp.content.read(1024 * 1024)
-
-                    encoding = resp.charset or "utf-8"
-                    text = chunk.decode(encoding, errors="replace")
-
-                    if not (200 <= resp.status < 300):
-                        return (
-                            "error",
-                            resp.status,
-                            f"Server returned status {resp.status}:\n{text[:500]}",
-                        )
-
-                    try:
-                        # Prettify JSON if applicable
-                        return (
-                            "success",
-                            resp.status,
-                            json.dumps(json.loads(text), indent=2),
-                        )
-                    except (json.JSONDecodeError, TypeError):
-                        return ("success", resp.status, text)
+            method = req_type.upper()
+
+            req_kwargs = {
+                "headers": headers,
+                "allow_redirects": False,
+            }  # Block redirects for SSRF safety
+            if method in ("GET", "HEAD", "DELETE"):
+                req_kwargs["params"] = payload
+            else:
+                req_kwargs["json"] = payload
+
+            async with self._session.request(method, endpoint, **req_kwargs) as resp:
+                chunk = await resp.content.read(_MAX_READ_BYTES)
+
+                encoding = resp.charset or "utf-8"
+                text = chunk.decode(encoding, errors="replace")
+
+                if not (200 <= resp.status < 300):
+                    return (
+                        "error",
+                        resp.status,
+                        f"Server returned status {resp.status}:\n{text[:500]}",
+                    )
+
+                # Bodies too large to display are passed through raw and truncated
+                if len(text) > _DISPLAY_LIMIT:
+                    return ("success", resp.status, text)
+
+                try:
+                    # Prettify JSON if applicable
+                    return (
+                        "success",
+                        resp.status,
+                        json.dumps(json.loads(text), indent=2, ensure_ascii=False),
+                    )
+                except (json.JSONDecodeError, TypeError):
+                    return ("success", resp.status, text)
 
         except ValueError as e:
             return ("error", None, f"Security Block: {str(e)}")
@@ -175,7 +199,9 @@ class PostmanCog(commands.Cog, name="Postman"):
 
         content = content.replace("```", "` ` `")
 
-        truncated = content[:3800] + ("\n...[truncated]" if len(content) > 3800 else "")
+        truncated = content[:_DISPLAY_LIMIT] + (
+            "\n...[truncated]" if len(content) > _DISPLAY_LIMIT else ""
+        )
         lang = (
             "json" if (content.startswith("{") or content.startswith("[")) else "text"
         )
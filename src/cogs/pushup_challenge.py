@@ -1,17 +1,59 @@
+import asyncio
+import functools
+import heapq
 import json
+import logging
 import math
-from datetime import datetime, timedelta
+import os
+from dataclasses import dataclass, fields
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Optional
 
 import discord
 from discord.ext import commands, tasks
 from discord import Embed, Color
 
+log = logging.getLogger(__name__)
+
+# orjson is optional; it parses/serializes several times faster than json
+try:
+    import orjson
+
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+except ImportError:
+    _loads = json.loads
+
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode()
+
+
 # Configuration
-EVENT_START = datetime(2026, 2, 7, 0, 1)  # Feb 7th, 12:01 AM, 2026
+# Feb 7th, 12:01 AM, 2026 in the host's local time, pinned to an aware datetime
+EVENT_START = datetime(2026, 2, 7, 0, 1).astimezone()
 EVENT_DURATION = timedelta(hours=24)
 EVENT_END = EVENT_START + EVENT_DURATION
+# When each reminder becomes due; a reminder whose moment has passed unsent is skipped
+REMINDER_DEADLINES = {
+    "one_h_warning": EVENT_START - timedelta(hours=1),
+    "start": EVENT_START,
+    "halfway": EVENT_START + EVENT_DURATION / 2,
+    "one_h_left": EVENT_END - timedelta(hours=1),
+    "end": EVENT_END,
+}
+# Reminders field name -> key used in pushup_data.json
+REMINDER_JSON_KEYS = {
+    "one_h_warning": "1h_warning",
+    "start": "start",
+    "halfway": "halfway_time",
+    "one_h_left": "1h_left",
+    "end": "end",
+}
+# Upper bound on a single sleep so wall-clock jumps (suspend, NTP) are picked up
+MAX_SLEEP_SECONDS = 3600
+EVENT_START_HUMAN = EVENT_START.strftime("%H:%M")
+EVENT_END_HUMAN = EVENT_END.strftime("%Y-%m-%d %H:%M")
 GOAL_PUSHUPS = 1000
 DATA_FILE = Path(__file__).parent.parent / "data" / "pushup_data.json"
 
@@ -22,28 +64,56 @@ COLOR_SUCCESS = Color.from_rgb(46, 204, 113)  # Green
 COLOR_WARNING = Color.from_rgb(230, 126, 34)  # Orange
 COLOR_CRITICAL = Color.from_rgb(231, 76, 60)  # Red
 COLOR_DARK = Color.from_rgb(44, 47, 51)  # Dark Grey
+MEDALS = ("🥇", "🥈", "🥉")
+
+
+@dataclass(slots=True)
+class Reminders:
+    """Which event announcements have already gone out."""
+
+    one_h_warning: bool = False
+    start: bool = False
+    halfway: bool = False
+    one_h_left: bool = False
+    end: bool = False
+
+    @classmethod
+    def from_json(cls, raw: Dict) -> "Reminders":
+        return cls(
+            **{f.name: bool(raw.get(REMINDER_JSON_KEYS[f.name])) for f in fields(cls)}
+        )
+
+    def to_json(self) -> Dict:
+        return {key: getattr(self, name) for name, key in REMINDER_JSON_KEYS.items()}
 
 
 class PushUpChallengeCog(commands.Cog, name="PushUpChallenge"):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
-        self.data: Dict = {
-            "total_pushups": 0,
-            "contributions": {},  # UserID (str) -> Count (int)
-            "reminders_sent": {
-                "1h_warning": False,
-                "start": False,
-                "halfway_time": False,
-                "1h_left": False,
-                "end": False,
-            },
-        }
+        self.total = 0
+        self.contributions: Dict[str, int] = {}  # UserID (str) -> Count (int)
+        self.reminders = Reminders()
+        self._dirty = False
+        # Same contributions keyed by int UserID, for member lookups
+        self._contrib_int: Dict[int, int] = {}
+        self._leaderboard_cache: list | None = None  # Top 10 (uid, count); None = stale
+        self._pace_cache: tuple[tuple, str] | None = None  # ((total, minute), pace)
+        # GuildID -> channel to announce in; resolved on ready, kept fresh by listeners
+        self._broadcast_channels: Dict[int, discord.TextChannel] = {}
         self._ensure_data_dir()
         self._load_data()
-        self.event_loop.start()
+        self._scheduler_task: Optional[asyncio.Task] = None
+        self._flush_loop.start()
+
+    async def cog_load(self):
+        self._scheduler_task = asyncio.create_task(self._reminder_scheduler())
 
     def cog_unload(self):
-        self.event_loop.cancel()
+        if self._scheduler_task:
+            self._scheduler_task.cancel()
+        self._flush_loop.cancel()
+        if self._dirty:
+            self._save_data_now()
 
     # --- Persistence Helpers ---
     def _ensure_data_dir(self):
@@ -53,23 +123,49 @@ class PushUpChallengeCog(commands.Cog, name="PushUpChallenge"):
     def _load_data(self):
         if DATA_FILE.exists():
             try:
-                with open(DATA_FILE, "r") as f:
-                    saved_data = json.load(f)
-                    self.data.update(saved_data)
+                saved_data = _loads(DATA_FILE.read_bytes())
+                reminders = Reminders.from_json(saved_data.get("reminders_sent", {}))
+                contributions = saved_data.get("contributions", {})
+                contrib_int = {int(uid): count for uid, count in contributions.items()}
+                self.total = saved_data.get("total_pushups", 0)
+                self.contributions = contributions
+                self._contrib_int = contrib_int
+                self.reminders = reminders
             except Exception as e:
                 print(f"PushUpChallenge: Error loading data: {e}")
         else:
-            self._save_data()
+            self._save_data_now()
 
     def _save_data(self):
+        """Marks data as changed; the flush loop writes it out within a few seconds."""
+        self._dirty = True
+
+    def _save_data_now(self):
+        """Writes data to disk immediately, via a temp file so a crash never truncates it."""
         try:
-            with open(DATA_FILE, "w") as f:
-                json.dump(self.data, f, indent=4)
+            payload = _dumps(
+                {
+                    "total_pushups": self.total,
+                    "contributions": self.contributions,
+                    "reminders_sent": self.reminders.to_json(),
+                }
+            )
+            tmp_file = DATA_FILE.with_suffix(".tmp")
+            tmp_file.write_bytes(payload)
+            os.replace(tmp_file, DATA_FILE)
+            self._dirty = False
         except Exception as e:
             print(f"PushUpChallenge: Error saving data: {e}")
 
+    @tasks.loop(seconds=5)
+    async def _flush_loop(self):
+        if self._dirty:
+            self._save_data_now()
+
     # --- Formatting Helpers ---
-    def _get_progress_bar(self, current: int, total: int, length: int = 15) -> str:
+    @staticmethod
+    @functools.lru_cache(maxsize=64)
+    def _get_progress_bar(current: int, total: int, length: int = 15) -> str:
         percent = min(1.0, current / total) if total > 0 else 0
         filled_length = int(length * percent)
 
@@ -80,8 +176,7 @@ class PushUpChallengeCog(commands.Cog, name="PushUpChallenge"):
         bar = bar_char * filled_length + empty_char * (length - filled_length)
         return f"`{bar}` **{int(percent * 100)}%**"
 
-    def _format_time_remaining(self, target_dt: datetime) -> str:
-        now = datetime.now()
+    def _format_time_remaining(self, target_dt: datetime, now: datetime) -> str:
         if now >= target_dt:
             return "00h 00m"
         diff = target_dt - now
@@ -90,16 +185,23 @@ class PushUpChallengeCog(commands.Cog, name="PushUpChallenge"):
         minutes = (total_seconds % 3600) // 60
         return f"{hours}h {minutes}m"
 
-    def _get_required_pace(self) -> str:
+    def _get_required_pace(self, now: datetime) -> str:
         """Calculates push-ups needed per hour to finish on time."""
-        now = datetime.now()
+        key = (self.total, int(now.timestamp()) // 60)
+        if self._pace_cache and self._pace_cache[0] == key:
+            return self._pace_cache[1]
+        pace = self._compute_required_pace(now)
+        self._pace_cache = (key, pace)
+        return pace
+
+    def _compute_required_pace(self, now: datetime) -> str:
         if now >= EVENT_END:
             return "0 / hr"
         if now < EVENT_START:
             hours_total = EVENT_DURATION.total_seconds() / 3600
             return f"{math.ceil(GOAL_PUSHUPS / hours_total)} / hr"
 
-        remaining_reps = max(0, GOAL_PUSHUPS - self.data["total_pushups"])
+        remaining_reps = max(0, GOAL_PUSHUPS - self.total)
         remaining_seconds = (EVENT_END - now).total_seconds()
 
         if remaining_seconds <= 0:
@@ -109,29 +211,101 @@ class PushUpChallengeCog(commands.Cog, name="PushUpChallenge"):
         pace = math.ceil(remaining_reps / remaining_hours)
         return f"{pace} / hr"
 
-    async def _broadcast_message(self, embed: Embed):
+    # --- Broadcast Channels ---
+    @staticmethod
+    def _resolve_broadcast_channel(
+        guild: discord.Guild,
+    ) -> Optional[discord.TextChannel]:
+        channel = discord.utils.get(guild.text_channels, name="general")
+        if not channel:
+            channel = discord.utils.get(guild.text_channels, name="announcements")
+        if not channel and guild.text_channels:
+            channel = guild.text_channels[0]
+        return channel
+
+    def _refresh_broadcast_channel(self, guild: discord.Guild):
+        channel = self._resolve_broadcast_channel(guild)
+        if channel:
+            self._broadcast_channels[guild.id] = channel
+        else:
+            self._broadcast_channels.pop(guild.id, None)
+
+    def _rebuild_broadcast_channels(self):
+        self._broadcast_channels.clear()
         for guild in self.bot.guilds:
-            channel = discord.utils.get(guild.text_channels, name="general")
-            if not channel:
-                channel = discord.utils.get(guild.text_channels, name="announcements")
-            if not channel and guild.text_channels:
-                channel = guild.text_channels[0]
-
-            if channel:
-                try:
-                    await channel.send(embed=embed)
-                except discord.Forbidden:
-                    pass
-
-    # --- Event Loop ---
-    @tasks.loop(minutes=1)
-    async def event_loop(self):
-        now = datetime.now()
+            self._refresh_broadcast_channel(guild)
+
+    @commands.Cog.listener()
+    async def on_ready(self):
+        self._rebuild_broadcast_channels()
+
+    @commands.Cog.listener()
+    async def on_guild_join(self, guild: discord.Guild):
+        self._refresh_broadcast_channel(guild)
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild: discord.Guild):
+        self._broadcast_channels.pop(guild.id, None)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_create(self, channel: discord.abc.GuildChannel):
+        self._refresh_broadcast_channel(channel.guild)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel: discord.abc.GuildChannel):
+        self._refresh_broadcast_channel(channel.guild)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_update(
+        self, before: discord.abc.GuildChannel, after: discord.abc.GuildChannel
+    ):
+        self._refresh_broadcast_channel(after.guild)
+
+    async def _broadcast_message(self, embed: Embed):
+        # Cog may have been (re)loaded after on_ready fired
+        if not self._broadcast_channels:
+            self._rebuild_broadcast_channels()
+
+        for channel in list(self._broadcast_channels.values()):
+            try:
+                await channel.send(embed=embed)
+            except discord.Forbidden:
+                pass
+
+    # --- Reminder Scheduler ---
+    def _next_reminder_deadline(self, now: datetime) -> Optional[datetime]:
+        upcoming = [
+            deadline
+            for name, deadline in REMINDER_DEADLINES.items()
+            if not getattr(self.reminders, name) and deadline > now
+        ]
+        return min(upcoming, default=None)
+
+    async def _reminder_scheduler(self):
+        """Sleeps until the next reminder is due instead of polling every minute."""
+        await self.bot.wait_until_ready()
+        while True:
+            now = datetime.now(timezone.utc)
+            try:
+                await self._check_reminders(now)
+            except Exception:
+                log.exception("Error sending reminders")
+                await asyncio.sleep(60)
+                continue
+
+            deadline = self._next_reminder_deadline(now)
+            if deadline is None:
+                # Nothing left to announce
+                return
+            delay = (deadline - now).total_seconds()
+            await asyncio.sleep(min(delay, MAX_SLEEP_SECONDS))
+
+    async def _check_reminders(self, now: datetime):
+        reminders = self.reminders
 
         # 1. Pre-Event Warning (1 Hour before)
-        if not self.data["reminders_sent"]["1h_warning"]:
-            time_until_start = EVENT_START - now
-            if timedelta(minutes=0) < time_until_start <= timedelta(hours=1):
+        if now < EVENT_START:
+            if not reminders.one_h_warning and EVENT_START - now <= timedelta(hours=1):
                 embed = Embed(title="⏳ Preparation Phase", color=COLOR_PENDING)
                 embed.description = (
                     "**The 1,000 Push-up Challenge begins in 1 hour.**\n"
@@ -139,37 +313,34 @@ class PushUpChallengeCog(commands.Cog, name="PushUpChallenge"):
                 )
                 embed.add_field(
                     name="Start Time",
-                    value=f"`{EVENT_START.strftime('%H:%M')}`",
+                    value=f"`{EVENT_START_HUMAN}`",
                     inline=True,
                 )
                 embed.add_field(
                     name="Target", value=f"`{GOAL_PUSHUPS} Reps`", inline=True
                 )
                 await self._broadcast_message(embed)
-                self.data["reminders_sent"]["1h_warning"] = True
-                self._save_data()
+                reminders.one_h_warning = True
+                self._save_data_now()
+            return
 
         # 2. Event Start
-        if not self.data["reminders_sent"]["start"]:
-            if now >= EVENT_START:
-                embed = Embed(title="🟢 Event Started", color=COLOR_SUCCESS)
-                embed.description = (
-                    "**The 24-hour timer has begun.**\n"
-                    f"Team Goal: **{GOAL_PUSHUPS}** push-ups.\n\n"
-                    "Use `!pushups log <amount>` to contribute."
-                )
-                embed.set_footer(text=f"Ends at {EVENT_END.strftime('%Y-%m-%d %H:%M')}")
-                await self._broadcast_message(embed)
-                self.data["reminders_sent"]["start"] = True
-                self._save_data()
-
-        # 3. Halfway Point
-        if (
-            EVENT_START <= now < EVENT_END
-            and not self.data["reminders_sent"]["halfway_time"]
-        ):
-            if (now - EVENT_START) >= EVENT_DURATION / 2:
-                current = self.data["total_pushups"]
+        if not reminders.start:
+            embed = Embed(title="🟢 Event Started", color=COLOR_SUCCESS)
+            embed.description = (
+                "**The 24-hour timer has begun.**\n"
+                f"Team Goal: **{GOAL_PUSHUPS}** push-ups.\n\n"
+                "Use `!pushups log <amount>` to contribute."
+            )
+            embed.set_footer(text=f"Ends at {EVENT_END_HUMAN}")
+            await self._broadcast_message(embed)
+            reminders.start = True
+            self._save_data_now()
+
+        if now < EVENT_END:
+            # 3. Halfway Point
+            if not reminders.halfway and (now - EVENT_START) >= EVENT_DURATION / 2:
+                current = self.total
                 embed = Embed(title="clock: Halfway Mark", color=COLOR_ACTIVE)
                 embed.add_field(
                     name="Current Total", value=f"**{current}**", inline=True
@@ -185,16 +356,12 @@ class PushUpChallengeCog(commands.Cog, name="PushUpChallenge"):
                     inline=False,
                 )
                 await self._broadcast_message(embed)
-                self.data["reminders_sent"]["halfway_time"] = True
-                self._save_data()
-
-        # 4. Final Hour
-        if (
-            EVENT_START <= now < EVENT_END
-            and not self.data["reminders_sent"]["1h_left"]
-        ):
-            if (EVENT_END - now) <= timedelta(hours=1):
-                current = self.data["total_pushups"]
+                reminders.halfway = True
+                self._save_data_now()
+
+            # 4. Final Hour
+            if not reminders.one_h_left and (EVENT_END - now) <= timedelta(hours=1):
+                current = self.total
                 needed = max(0, GOAL_PUSHUPS - current)
 
                 color = COLOR_CRITICAL if needed > 0 else COLOR_SUCCESS
@@ -208,49 +375,43 @@ class PushUpChallengeCog(commands.Cog, name="PushUpChallenge"):
                     name="Current Pace Needed", value=f"**{needed} / hr**", inline=False
                 )
                 await self._broadcast_message(embed)
-                self.data["reminders_sent"]["1h_left"] = True
-                self._save_data()
+                reminders.one_h_left = True
+                self._save_data_now()
+            return
 
         # 5. Event End
-        if not self.data["reminders_sent"]["end"]:
-            if now >= EVENT_END:
-                current = self.data["total_pushups"]
-                success = current >= GOAL_PUSHUPS
-
-                embed = Embed(
-                    title="🏆 Challenge Complete" if success else "❌ Challenge Failed",
-                    color=COLOR_SUCCESS if success else COLOR_DARK,
-                )
+        if not reminders.end:
+            current = self.total
+            success = current >= GOAL_PUSHUPS
 
-                result_msg = (
-                    f"We completed **{current}** out of **{GOAL_PUSHUPS}** push-ups."
-                )
-                embed.description = f"**Time is up.**\n{result_msg}"
+            embed = Embed(
+                title="🏆 Challenge Complete" if success else "❌ Challenge Failed",
+                color=COLOR_SUCCESS if success else COLOR_DARK,
+            )
+
+            result_msg = (
+                f"We completed **{current}** out of **{GOAL_PUSHUPS}** push-ups."
+            )
+            embed.description = f"**Time is up.**\n{result_msg}"
+            embed.add_field(
+                name="Final Status",
+                value="SUCCESS" if success else "INCOMPLETE",
+                inline=False,
+            )
+
+            # Top contributor shoutout
+            if self.contributions:
+                top_user_id = max(self.contributions, key=self.contributions.get)
+                top_count = self.contributions[top_user_id]
                 embed.add_field(
-                    name="Final Status",
-                    value="SUCCESS" if success else "INCOMPLETE",
+                    name="MVP",
+                    value=f"<@{top_user_id}> ({top_count} reps)",
                     inline=False,
                 )
 
-                # Top contributor shoutout
-                if self.data["contributions"]:
-                    top_user_id = max(
-                        self.data["contributions"], key=self.data["contributions"].get
-                    )
-                    top_count = self.data["contributions"][top_user_id]
-                    embed.add_field(
-                        name="MVP",
-                        value=f"<@{top_user_id}> ({top_count} reps)",
-                        inline=False,
-                    )
-
-                await self._broadcast_message(embed)
-                self.data["reminders_sent"]["end"] = True
-                self._save_data()
-
-    @event_loop.before_loop
-    async def before_event_loop(self):
-        await self.bot.wait_until_ready()
+            await self._broadcast_message(embed)
+            reminders.end = True
+            self._save_data_now()
 
     # --- Commands ---
     @commands.group(name="pushups", aliases=["pu"], invoke_without_command=True)
@@ -264,12 +425,12 @@ class PushUpChallengeCog(commands.Cog, name="PushUpChallenge"):
         Log contribution to the total.
         Usage: !pushups log 25
         """
-        now = datetime.now()
+        now = datetime.now(timezone.utc)
 
         if now < EVENT_START:
             embed = Embed(title="🚫 Event Not Started", color=COLOR_PENDING)
             embed.description = (
-                f"Starts in **{self._format_time_remaining(EVENT_START)}**."
+                f"Starts in **{self._format_time_remaining(EVENT_START, now)}**."
             )
             await ctx.reply(embed=embed)
             return
@@ -290,13 +451,16 @@ class PushUpChallengeCog(commands.Cog, name="PushUpChallenge"):
         user_id = str(ctx.author.id)
 
         # Update Logic
-        self.data["total_pushups"] += amount
-        current_user_total = self.data["contributions"].get(user_id, 0) + amount
-        self.data["contributions"][user_id] = current_user_total
+        self.total += amount
+        current_user_total = self.contributions.get(user_id, 0) + amount
+        self.contributions[user_id] = current_user_total
+        self._contrib_int[ctx.author.id] = current_user_total
+        self._leaderboard_cache = None
+        self._pace_cache = None
         self._save_data()
 
         # Calculate impact
-        total = self.data["total_pushups"]
+        total = self.total
         remaining = max(0, GOAL_PUSHUPS - total)
 
         embed = Embed(title="✅ Contribution Recorded", color=COLOR_SUCCESS)
@@ -325,13 +489,13 @@ class PushUpChallengeCog(commands.Cog, name="PushUpChallenge"):
     @pushups_group.command(name="stats", aliases=["dashboard"])
     async def stats_command(self, ctx: commands.Context):
         """View the main event dashboard and leaderboard."""
-        total = self.data["total_pushups"]
-        now = datetime.now()
+        now = datetime.now(timezone.utc)
+        total = self.total
 
         # Determine State
         if now < EVENT_START:
             state_color = COLOR_PENDING
-            time_val = self._format_time_remaining(EVENT_START)
+            time_val = self._format_time_remaining(EVENT_START, now)
             time_label = "Starts In"
         elif now >= EVENT_END:
             state_color = COLOR_DARK
@@ -339,7 +503,7 @@ class PushUpChallengeCog(commands.Cog, name="PushUpChallenge"):
             time_label = "Status"
         else:
             state_color = COLOR_ACTIVE
-            time_val = self._format_time_remaining(EVENT_END)
+            time_val = self._format_time_remaining(EVENT_END, now)
             time_label = "Time Remaining"
 
         embed = Embed(title="Push-up Challenge Dashboard", color=state_color)
@@ -351,7 +515,7 @@ class PushUpChallengeCog(commands.Cog, name="PushUpChallenge"):
         embed.add_field(name=time_label, value=f"`{time_val}`", inline=True)
 
         if now < EVENT_END:
-            pace = self._get_required_pace()
+            pace = self._get_required_pace(now)
             embed.add_field(name="Required Pace", value=f"`{pace}`", inline=True)
 
         # Visual Bar
@@ -362,16 +526,17 @@ class PushUpChallengeCog(commands.Cog, name="PushUpChallenge"):
         )
 
         # Leaderboard
-        sorted_contributors = sorted(
-            self.data["contributions"].items(), key=lambda item: item[1], reverse=True
-        )
+        if self._leaderboard_cache is None:
+            self._leaderboard_cache = heapq.nlargest(
+                10, self._contrib_int.items(), key=lambda item: item[1]
+            )
+        top_contributors = self._leaderboard_cache
 
-        if not sorted_contributors:
+        if not top_contributors:
             lb_text = "*No data recorded yet.*"
         else:
             lines = []
-            for i, (uid, count) in enumerate(sorted_contributors[:10], 1):
-                user_id = int(uid)
+            for i, (user_id, count) in enumerate(top_contributors, 1):
                 # 1. Try to find member in server cache
                 user = ctx.guild.get_member(user_id) if ctx.guild else None
                 name = None
@@ -394,17 +559,10 @@ class PushUpChallengeCog(commands.Cog, name="PushUpChallenge"):
                             name = user.display_name
                         except Exception:
                             # 4. Final Fallback: Display raw ID if API fails
-                            name = f"User_{uid}"
+                            name = f"User_{user_id}"
 
                 # Medals
-                if i == 1:
-                    prefix = "🥇"
-                elif i == 2:
-                    prefix = "🥈"
-                elif i == 3:
-                    prefix = "🥉"
-                else:
-                    prefix = f"**{i}.**"
+                prefix = MEDALS[i - 1] if i <= len(MEDALS) else f"**{i}.**"
 
                 lines.append(f"{prefix} **{count}** - {name}")
             lb_text = "\n".join(lines)
@@ -1,9 +1,14 @@
+import json
 import re
+from collections import deque
 from discord.ext import commands
 from datetime import datetime, timezone, timedelta
 from services.litellm_service import LiteLLMService
 from langchain_core.prompts import ChatPromptTemplate
 
+# Bound once so each parse skips the pattern attribute lookup
+_DURATION_MATCH = re.compile(r"^\s*(\d+)\s*([mMhH]?)\s*$").match
+
 
 class RundownCog(commands.Cog, name="Rundown"):
     def __init__(self, bot: commands.Bot):
@@ -23,11 +28,14 @@ class RundownCog(commands.Cog, name="Rundown"):
             ]
         )
 
-    _DURATION_RE = re.compile(r"^\s*(\d+)\s*([mMhH]?)\s*$")
+    _SKIP_AUTHORS = frozenset({"ChatArchive", "BNBD"})
+    _MAX_MESSAGE_CHARS = 500
+    _MAX_PROMPT_CHARS = 30_000
+    _MIN_MESSAGES = 3  # Fewer than this can just be read; skip the LLM call
 
     @staticmethod
     def _parse_duration_to_timedelta(duration_raw: str):
-        match = RundownCog._DURATION_RE.match(duration_raw or "")
+        match = _DURATION_MATCH(duration_raw or "")
         if not match:
             raise ValueError("Invalid duration. Try `!rundown 60m` or `!rundown 2h`.")
 
@@ -59,32 +67,53 @@ class RundownCog(commands.Cog, name="Rundown"):
             return
 
         cutoff = datetime.now(timezone.utc) - delta
-        messages_2d: list[list[str]] = []
-
-        async for msg in ctx.channel.history(limit=1000):
+        # Each entry is one pre-encoded JSON [sender, message] pair
+        entries: deque[str] = deque()
+        total_len = 0
+
+        # Newest first so the 1000 cap keeps the most recent messages; appendleft
+        # puts them back in chronological order. Newest-first paging only filters
+        # `after` client-side, so stop at the cutoff ourselves to end paging there.
+        async for msg in ctx.channel.history(limit=1000, oldest_first=False):
             if msg.created_at < cutoff:
                 break
-
-            if msg.content.strip().lower().startswith(
-                "!rundown"
-            ) or msg.author.display_name in ("ChatArchive", "BNBD"):
+            content = msg.content
+            author_name = msg.author.display_name
+            # Only lowercase the 8-char head, not the whole message
+            if (
+                content.lstrip()[:8].lower() == "!rundown"
+                or author_name in self._SKIP_AUTHORS
+            ):
                 continue
 
-            messages_2d.append([msg.author.display_name, msg.content])
-
-        messages_2d.reverse()
+            entry = json.dumps(
+                (author_name, content[: self._MAX_MESSAGE_CHARS]),
+                ensure_ascii=False,
+                separators=(",", ":"),
+            )
+            total_len += len(entry) + 1
+            if total_len > self._MAX_PROMPT_CHARS:
+                # Budget spent; everything older than this is dropped
+                break
+            entries.appendleft(entry)
 
-        if not messages_2d:
+        if not entries:
             await ctx.reply(
                 f"No messages found in the last {amount} {unit} to summarize."
             )
             return
+        if len(entries) < self._MIN_MESSAGES:
+            await ctx.reply(
+                f"Only {len(entries)} message{'s' if len(entries) != 1 else ''} in the last {amount} {unit}, not enough to need a rundown."
+            )
+            return
 
-        print(f"Total messages included: {len(messages_2d)}")
+        print(f"Total messages included: {len(entries)}")
 
-        prompt_value = await self.prompt.ainvoke({"messages": str(messages_2d)})
+        convo = "[" + ",".join(entries) + "]"
+        prompt_value = await self.prompt.aformat_prompt(messages=convo)
         summary = None
-        prefix = f"Ts da runDown :3 for the {len(messages_2d)} messages from the past {amount} {unit}:\n\n"
+        prefix = f"Ts da runDown :3 for the {len(entries)} messages from the past {amount} {unit}:\n\n"
         warning_msg = None
 
         async with ctx.typing():
@@ -94,6 +123,7 @@ class RundownCog(commands.Cog, name="Rundown"):
                     self.llm_service.primary_llm,
                     prompt_value,
                     prefix=prefix,
+                    use_cache=True,
                 )
             except Exception as e:
                 print(f"Rundown: API Error: {e}")
@@ -106,6 +136,7 @@ class RundownCog(commands.Cog, name="Rundown"):
                         self.llm_service.fallback_llm,
                         prompt_value,
                         prefix=prefix,
+                        use_cache=True,
                     )
                 except Exception as fallback_e:
                     print(f"Rundown: Fallback Error: {fallback_e}")
@@ -1,21 +1,89 @@
 from __future__ import annotations
 
 import asyncio
-import re
+import functools
+import heapq
+import itertools
+import logging
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Optional, Tuple, Dict, Set
+from typing import Optional, Tuple, Dict, List
 
 import discord
 from discord.ext import commands
 
-# Regex for durations like "1h 30m 5s"
-DURATION_RE = re.compile(
-    r"^\s*(?:(\d+)\s*h)?\s*(?:(\d+)\s*m)?\s*(?:(\d+)\s*s)?\s*$", re.IGNORECASE
-)
-# Regex for times like "5pm", "17:30", "8:00 AM"
-TIME_RE = re.compile(r"^\s*(\d{1,2})(?::(\d{2}))?\s*(am|pm)?\s*$", re.IGNORECASE)
+log = logging.getLogger(__name__)
 
+# Seconds per unit for the single-unit fast path ("15m", "2h", "30s")
+_UNIT_SECONDS = {"h": 3600, "m": 60, "s": 1}
+_DURATION_UNITS = "hms"
+_CANCEL_WORDS = frozenset({"cancel", "stop"})
+_ONE_DAY = timedelta(days=1)
 
+
+def _parse_duration(raw: str) -> Optional[Tuple[int, int, int]]:
+    """
+    Scans durations like "1h 30m 5s" in a single pass.
+    Units must appear in h, m, s order and each at most once; whitespace is allowed
+    between tokens. Returns (hours, minutes, seconds), or None if it isn't a duration.
+    """
+    values = [0, 0, 0]
+    next_unit = 0  # Lowest unit index still allowed
+    i, n = 0, len(raw)
+    while i < n:
+        if raw[i].isspace():
+            i += 1
+            continue
+        j = i
+        while j < n and raw[j].isdecimal():
+            j += 1
+        if j == i:
+            return None
+        number = int(raw[i:j])
+        while j < n and raw[j].isspace():
+            j += 1
+        if j == n:
+            return None
+        unit = _DURATION_UNITS.find(raw[j].lower())
+        if unit < next_unit:  # Unknown (-1), repeated, or out of order
+            return None
+        values[unit] = number
+        next_unit = unit + 1
+        i = j + 1
+    if next_unit == 0:
+        return None
+    return values[0], values[1], values[2]
+
+
+def _parse_clock(raw: str) -> Optional[Tuple[int, int, Optional[str]]]:
+    """
+    Scans times like "5pm", "17:30", "8:00 AM": 1-2 hour digits, optional ":MM",
+    optional am/pm. Returns (hour, minute, "am"/"pm"/None), or None if it isn't a time.
+    """
+    raw = raw.strip()
+    n = len(raw)
+    j = 0
+    while j < n and j < 2 and raw[j].isdecimal():
+        j += 1
+    if j == 0:
+        return None
+    hour = int(raw[:j])
+
+    minute = 0
+    if j < n and raw[j] == ":":
+        digits = raw[j + 1 : j + 3]
+        if len(digits) != 2 or not digits.isdecimal():
+            return None
+        minute = int(digits)
+        j += 3
+
+    ampm = raw[j:].strip().lower() or None
+    if ampm not in (None, "am", "pm"):
+        return None
+    return hour, minute, ampm
+
+
+@functools.lru_cache(maxsize=256)
 def format_seconds_to_human(seconds: int) -> str:
     """Converts a duration in seconds to a human-readable string like '1 hour 2 minutes'."""
     if seconds <= 0:
@@ -50,28 +118,27 @@ def parse_timer_input(raw: str) -> Tuple[int, str]:
     if raw.isdigit():
         raw = f"{raw}m"
 
-    # First, try to parse as a duration (e.g., 15m, 2h)
-    duration_match = DURATION_RE.match(raw)
-    if duration_match and any(duration_match.groups()):
-        h = int(duration_match.group(1) or 0)
-        mi = int(duration_match.group(2) or 0)
-        s = int(duration_match.group(3) or 0)
+    # Common single-unit durations skip the full scan
+    unit_seconds = _UNIT_SECONDS.get(raw[-1:].lower())
+    if unit_seconds and raw[:-1].isdecimal():
+        total = int(raw[:-1]) * unit_seconds
+        human = format_seconds_to_human(total)
 
+    # Otherwise, try to parse as a combined duration (e.g., 1h30m)
+    elif duration := _parse_duration(raw):
+        h, mi, s = duration
         total = h * 3600 + mi * 60 + s
         human = format_seconds_to_human(total)
 
     else:
         # If not a duration, try to parse as a specific time (e.g., 5pm, 17:30)
-        time_match = TIME_RE.match(raw)
-        if not time_match:
+        clock = _parse_clock(raw)
+        if not clock:
             raise ValueError(
                 "Invalid format. Use a duration (e.g., `15m`, `2h`) or a time (e.g., `5pm`, `17:30`)."
             )
 
-        h_str, m_str, ampm = time_match.groups()
-        h = int(h_str)
-        mi = int(m_str or 0)
-        ampm = ampm.lower() if ampm else None
+        h, mi, ampm = clock
 
         # Validate time parts
         if not (0 <= mi <= 59):
@@ -96,13 +163,13 @@ def parse_timer_input(raw: str) -> Tuple[int, str]:
 
         # If the time has already passed today, set it for the next day
         if target_dt <= now:
-            target_dt += timedelta(days=1)
+            target_dt += _ONE_DAY
 
         total = int((target_dt - now).total_seconds())
 
         # *** FIX IS HERE ***
-        # Use a portable way to format the time without a leading zero
-        time_str = target_dt.strftime("%I:%M %p").lstrip("0")
+        # Format from the parsed hour/minute: no leading zero, no locale-dependent strftime
+        time_str = f"{h % 12 or 12}:{mi:02d} {'AM' if h < 12 else 'PM'}"
         human = f"until {time_str}"  # e.g., "until 3:59 AM"
 
     # Common guardrails for the final calculated duration
@@ -119,64 +186,95 @@ def parse_timer_input(raw: str) -> Tuple[int, str]:
     return total, human
 
 
+@dataclass(slots=True, eq=False)
+class _Timer:
+    """A pending timer. Cancelled timers stay in the heap and are skipped when due."""
+
+    channel: discord.abc.Messageable
+    mention: str
+    seconds: int
+    label: Optional[str]
+    key: tuple[int, int]
+    cancelled: bool = False
+
+
 class TimerCog(commands.Cog):
     """Simple timers: `!timer 15m [label]` or `!timer 5pm [label]` → replies when done."""
 
     def __init__(self, bot: commands.Bot):
         self.bot = bot
-        # Track tasks per (channel_id, user_id) so we can cancel by user/channel
-        self._active_tasks: Dict[tuple[int, int], Set[asyncio.Task]] = {}
+        # Track timers per (channel_id, user_id) so we can cancel by user/channel.
+        # Usually one timer per key, so a plain list beats a set here.
+        self._active_timers: Dict[tuple[int, int], List[_Timer]] = {}
+        # Min-heap of (deadline, seq, timer) drained by a single scheduler task
+        self._heap: list[tuple[float, int, _Timer]] = []
+        self._seq = itertools.count()
+        self._wake = asyncio.Event()
+        self._scheduler_task: Optional[asyncio.Task] = None
+
+    async def cog_load(self):
+        self._scheduler_task = asyncio.create_task(self._scheduler())
 
     def cog_unload(self):
-        # Cancel any outstanding timers on hot-reload/unload
-        for task_set in list(self._active_tasks.values()):
-            for t in list(task_set):
-                t.cancel()
-        self._active_tasks.clear()
+        # Drop any outstanding timers on hot-reload/unload
+        if self._scheduler_task:
+            self._scheduler_task.cancel()
+        self._heap.clear()
+        self._active_timers.clear()
 
     def _cancel_user_timers(self, channel_id: int, user_id: int) -> int:
         """Cancel all active timers for a given user in a given channel. Returns count canceled."""
-        key = (channel_id, user_id)
-        task_set = self._active_tasks.get(key)
-        if not task_set:
+        timers = self._active_timers.pop((channel_id, user_id), None)
+        if not timers:
             return 0
-        count = 0
-        for t in list(task_set):
-            t.cancel()
-            count += 1
-        self._active_tasks.pop(key, None)
-        return count
-
-    async def _sleep_and_notify(
-        self,
-        channel: discord.abc.Messageable,
-        mention: str,
-        seconds: int,
-        label: Optional[str],
-        owner_channel_id: int,
-        owner_user_id: int,
-    ):
-        try:
-            await asyncio.sleep(seconds)
-            # On completion, drop this task from the registry
-            key = (owner_channel_id, owner_user_id)
-            task_set = self._active_tasks.get(key)
-            if task_set:
-                # This coroutine corresponds to exactly one task; discard whichever is done.
-                for t in list(task_set):
-                    if t.done():
-                        task_set.discard(t)
-                if not task_set:
-                    self._active_tasks.pop(key, None)
-
-            duration_str = format_seconds_to_human(seconds)
-            suffix = f" **({label})**" if label else ""
-            await channel.send(
-                f"{mention} ⏰ Time’s up{suffix}: **{duration_str}** elapsed."
-            )
-        except asyncio.CancelledError:
-            # Timer cancelled due to reload/shutdown or explicit cancel
-            pass
+        for timer in timers:
+            timer.cancelled = True
+        return len(timers)
+
+    def _schedule(self, timer: _Timer):
+        deadline = asyncio.get_running_loop().time() + timer.seconds
+        heapq.heappush(self._heap, (deadline, next(self._seq), timer))
+        self._active_timers.setdefault(timer.key, []).append(timer)
+        # Wake the scheduler in case this timer is now the earliest
+        self._wake.set()
+
+    async def _scheduler(self):
+        loop = asyncio.get_running_loop()
+        heap = self._heap
+        while True:
+            self._wake.clear()
+            if not heap:
+                await self._wake.wait()
+                continue
+
+            delay = heap[0][0] - loop.time()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            _, _, timer = heapq.heappop(heap)
+            if timer.cancelled:
+                continue
+
+            # On completion, drop this timer from the registry
+            timers = self._active_timers.get(timer.key)
+            if timers:
+                timers.remove(timer)
+                if not timers:
+                    self._active_timers.pop(timer.key, None)
+
+            duration_str = format_seconds_to_human(timer.seconds)
+            suffix = f" **({timer.label})**" if timer.label else ""
+            try:
+                await timer.channel.send(
+                    f"{timer.mention} ⏰ Time’s up{suffix}: **{duration_str}** elapsed."
+                )
+            except Exception:
+                # Keep the scheduler alive; one failed send must not drop other timers
+                log.exception("Failed to send timer notification")
 
     @commands.command(name="timer")
     async def timer_command(
@@ -196,7 +294,8 @@ class TimerCog(commands.Cog):
           !timer cancel      # cancels all your timers in this channel
         """
         # Handle cancellation
-        if time_or_duration.lower() in {"cancel", "stop"}:
+        # Durations and times always contain a digit, so they skip the lower() copy
+        if time_or_duration.isalpha() and time_or_duration.lower() in _CANCEL_WORDS:
             canceled = self._cancel_user_timers(ctx.channel.id, ctx.author.id)
             if canceled:
                 await ctx.reply(
@@ -222,29 +321,15 @@ class TimerCog(commands.Cog):
                 f"⏱️ Timer set for **{human}**. I’ll ping you when it’s done."
             )
 
-        key = (ctx.channel.id, ctx.author.id)
-        task = asyncio.create_task(
-            self._sleep_and_notify(
+        self._schedule(
+            _Timer(
                 channel=ctx.channel,
                 mention=ctx.author.mention,
                 seconds=seconds,
                 label=label.strip() or None,
-                owner_channel_id=ctx.channel.id,
-                owner_user_id=ctx.author.id,
+                key=(ctx.channel.id, ctx.author.id),
             )
         )
-        # Register task under the user's key
-        self._active_tasks.setdefault(key, set()).add(task)
-
-        # When task finishes, ensure we remove it
-        def _cleanup(_t: asyncio.Task):
-            task_set = self._active_tasks.get(key)
-            if task_set:
-                task_set.discard(_t)
-                if not task_set:
-                    self._active_tasks.pop(key, None)
-
-        task.add_done_callback(_cleanup)
 
 
 async def setup(bot: commands.Bot):
@@ -2,21 +2,54 @@ import os
 from dotenv import load_dotenv
 from pathlib import Path
 import argparse
+import functools
+from dataclasses import dataclass
+
+# Resolved once at import; .env lives in the repository root, next to src/
+_CURRENT_SCRIPT_DIR = Path(__file__).resolve().parent.parent
+_DOTENV_PATH = _CURRENT_SCRIPT_DIR.parent / ".env"
+
+
+@dataclass(frozen=True, slots=True)
+class Config:
+    """Application settings, resolved once from CLI flags, .env and the environment."""
+
+    app_env: str  # 'dev' or 'prod'
+    discord_token: str
+    openai_key: str
+    tester_channel_id: int | None
+    supabase_url: str | None
+    thread_pool_size: int  # Worker threads for the bot's blocking-call executor
+    llm_max_inflight: int  # Maximum number of LLM requests in flight at once
+
+
+@functools.lru_cache(maxsize=1)
+def get_config() -> Config:
+    """
+    Builds the application Config on first call and returns the same instance afterwards.
+    Raises ValueError if a required setting is missing.
+    """
+    # load_dotenv writes into os.environ, so this one reference sees .env values too
+    env = os.environ
+
+    # Keep DOTENV_PATH for error messages and clarity
+    dotenv_path = _DOTENV_PATH
+
+    # Load .env file first so it can supply APP_ENV
+    if dotenv_path.exists():
+        load_dotenv(dotenv_path=dotenv_path, override=True)
+        print(f"INFO: Loaded .env file from: {dotenv_path}")
+    else:
+        print(
+            f"INFO: .env file not found at the expected parent directory location: {dotenv_path}. "
+            "Relying on system environment variables or defaults if tokens are not set."
+        )
 
-
-class ConfigManager:
-    _instance = None
-    _initialized = False  # Class-level flag to ensure __init__ logic runs only once
-
-    def __new__(cls, *args, **kwargs):
-        if not cls._instance:
-            cls._instance = super(ConfigManager, cls).__new__(cls, *args, **kwargs)
-        return cls._instance
-
-    def __init__(self):
-        if ConfigManager._initialized:
-            return
-
+    # Determine app_env: APP_ENV takes precedence, otherwise fall back to --dev/--prod
+    app_env = env.get("APP_ENV")
+    if app_env is not None:
+        app_env = app_env.strip().lower()
+    else:
         # Argument parsing
         parser = argparse.ArgumentParser(
             description="Set application environment (dev/prod).",
@@ -32,126 +65,100 @@ class ConfigManager:
         group.add_argument(
             "--prod", action="store_true", help="Run in production mode."
         )
-        args = parser.parse_args()  # Parses command-line arguments
+        # Unknown arguments (e.g. from a test runner) are ignored rather than exiting
+        args, _ = parser.parse_known_args()
 
-        # Determine app_env and store it as an instance variable
-        self._app_env = "dev"  # Default to development
+        app_env = "dev"  # Default to development
         if args.prod:
-            self._app_env = "prod"
+            app_env = "prod"
 
-        # Store DOTENV_PATH for error messages and clarity
-        CURRENT_SCRIPT_DIR = Path(__file__).resolve().parent.parent
-        self._dotenv_path = CURRENT_SCRIPT_DIR.parent / ".env"
+    # Load Discord token and Gemini key based on app_env
+    discord_token = None
 
-        # Load .env file
-        if self._dotenv_path.exists():
-            load_dotenv(dotenv_path=self._dotenv_path, override=True)
-            print(f"INFO: Loaded .env file from: {self._dotenv_path}")
-        else:
-            print(
-                f"INFO: .env file not found at the expected parent directory location: {self._dotenv_path}. "
-                "Relying on system environment variables or defaults if tokens are not set."
-            )
-
-        # Load Discord token and Gemini key based on app_env
-        self._discord_token = None
-
-        if self._app_env == "prod":
-            self._discord_token = os.getenv("DISCORD_TOKEN_PROD")
-            if not self._discord_token:
-                raise ValueError(
-                    f"ERROR: APP_ENV is 'prod' but DISCORD_TOKEN_PROD is not set. "
-                    f"Checked .env at '{self._dotenv_path}' and system environment variables."
-                )
-            print("INFO: Running in PRODUCTION mode.")
-        elif self._app_env == "dev":
-            self._discord_token = os.getenv("DISCORD_TOKEN_DEV")
-            if not self._discord_token:
-                raise ValueError(
-                    f"ERROR: APP_ENV is 'dev' (or default) but DISCORD_TOKEN_DEV is not set. "
-                    f"Checked .env at '{self._dotenv_path}' and system environment variables."
-                )
-            print("INFO: Running in DEVELOPMENT mode.")
-        else:
-            # This case should ideally not be reached if app_env is correctly defaulted or set by args.
+    if app_env == "prod":
+        discord_token = env.get("DISCORD_TOKEN_PROD")
+        if not discord_token:
             raise ValueError(
-                f"ERROR: Invalid APP_ENV value: '{self._app_env}'. Must be 'prod' or 'dev'. "
-                f"Checked .env at '{self._dotenv_path}' and system environment variables."
+                f"ERROR: APP_ENV is 'prod' but DISCORD_TOKEN_PROD is not set. "
+                f"Checked .env at '{dotenv_path}' and system environment variables."
             )
-
-        # Final check for the token
-        if not self._discord_token:
-            # This state should ideally not be reached if the logic above is correct and tokens are set.
+        print("INFO: Running in PRODUCTION mode.")
+    elif app_env == "dev":
+        discord_token = env.get("DISCORD_TOKEN_DEV")
+        if not discord_token:
             raise ValueError(
-                "CRITICAL: Discord token could not be loaded. Ensure APP_ENV is correctly set ('prod' or 'dev') "
-                "and the corresponding token (DISCORD_TOKEN_PROD or DISCORD_TOKEN_DEV) is available."
+                f"ERROR: APP_ENV is 'dev' (or default) but DISCORD_TOKEN_DEV is not set. "
+                f"Checked .env at '{dotenv_path}' and system environment variables."
             )
+        print("INFO: Running in DEVELOPMENT mode.")
+    else:
+        # This case should ideally not be reached if app_env is correctly defaulted or set by args.
+        raise ValueError(
+            f"ERROR: Invalid APP_ENV value: '{app_env}'. Must be 'prod' or 'dev'. "
+            f"Checked .env at '{dotenv_path}' and system environment variables."
+        )
 
-        # Load OpenAI key
-        self._openai_key = os.getenv("OPENAI_API_KEY")
-
-        if not self._openai_key:
-            raise ValueError(
-                f"ERROR: OPENAI_API_KEY is not set. "
-                f"Checked .env at '{self._dotenv_path}' and system environment variables."
-            )
+    # Load OpenAI key
+    openai_key = env.get("OPENAI_API_KEY")
 
-        # Load Tester Channel ID
-        self._tester_channel_id = None
-        tester_channel_id_str = os.getenv("TESTER_CHANNEL_ID")
-        if tester_channel_id_str:
-            try:
-                self._tester_channel_id = int(tester_channel_id_str)
-                print(f"INFO: Loaded TESTER_CHANNEL_ID: {self._tester_channel_id}")
-            except ValueError:
-                print(
-                    f"WARNING: TESTER_CHANNEL_ID '{tester_channel_id_str}' is not a valid integer. Ignoring."
-                )
-        else:
-            print(
-                "INFO: TESTER_CHANNEL_ID environment variable not set. The ignore_channel_in_prod decorator will not function."
-            )
+    if not openai_key:
+        raise ValueError(
+            f"ERROR: OPENAI_API_KEY is not set. "
+            f"Checked .env at '{dotenv_path}' and system environment variables."
+        )
 
-        self._supabase_url = os.getenv("SUPABASE_URL")
-        if self._supabase_url:
-            print("INFO: Loaded SUPABASE_URL.")
-        else:
+    # Load Tester Channel ID
+    tester_channel_id = None
+    tester_channel_id_str = env.get("TESTER_CHANNEL_ID")
+    if tester_channel_id_str:
+        try:
+            tester_channel_id = int(tester_channel_id_str)
+            print(f"INFO: Loaded TESTER_CHANNEL_ID: {tester_channel_id}")
+        except ValueError:
             print(
-                "INFO: SUPABASE_URL environment variable not set. GIF storage commands will not function."
+                f"WARNING: TESTER_CHANNEL_ID '{tester_channel_id_str}' is not a valid integer. Ignoring."
             )
+    else:
+        print(
+            "INFO: TESTER_CHANNEL_ID environment variable not set. The ignore_channel_in_prod decorator will not function."
+        )
 
-        ConfigManager._initialized = True
+    supabase_url = env.get("SUPABASE_URL")
+    if supabase_url:
+        print("INFO: Loaded SUPABASE_URL.")
+    else:
+        print(
+            "INFO: SUPABASE_URL environment variable not set. GIF storage commands will not function."
+        )
 
-    def get_discord_token(self) -> str:
-        """Returns the loaded Discord token."""
-        if self._discord_token is None:
-            # This should not happen if __init__ completed successfully.
-            raise RuntimeError(
-                "Discord token accessed before initialization or initialization failed."
-            )
-        return self._discord_token
-
-    def get_app_env(self) -> str:
-        """Returns the current application environment ('dev' or 'prod')."""
-        if self._app_env is None:
-            # This should not happen if __init__ completed successfully.
-            raise RuntimeError(
-                "App environment accessed before initialization or initialization failed."
+    # Size of the bot's default executor for blocking calls (DNS lookups, etc.)
+    thread_pool_size = 64
+    thread_pool_str = env.get("BOT_THREAD_POOL")
+    if thread_pool_str:
+        try:
+            thread_pool_size = max(1, int(thread_pool_str))
+        except ValueError:
+            print(
+                f"WARNING: BOT_THREAD_POOL '{thread_pool_str}' is not a valid integer. Using {thread_pool_size}."
             )
-        return self._app_env
 
-    def get_openai_key(self) -> str:
-        """Returns the loaded OpenAI API key."""
-        if self._openai_key is None:
-            raise RuntimeError(
-                "OpenAI key accessed before initialization or initialization failed."
+    # Maximum number of LLM requests allowed in flight at once
+    llm_max_inflight = 8
+    llm_max_inflight_str = env.get("LLM_MAX_INFLIGHT")
+    if llm_max_inflight_str:
+        try:
+            llm_max_inflight = max(1, int(llm_max_inflight_str))
+        except ValueError:
+            print(
+                f"WARNING: LLM_MAX_INFLIGHT '{llm_max_inflight_str}' is not a valid integer. Using {llm_max_inflight}."
             )
-        return self._openai_key
-
-    def get_tester_channel_id(self) -> int | None:
-        """Returns the loaded tester channel ID or None if not set/invalid."""
-        return self._tester_channel_id
 
-    def get_supabase_url(self) -> str | None:
-        """Returns the Supabase Postgres connection URL or None if not set."""
-        return self._supabase_url
+    return Config(
+        app_env=app_env,
+        discord_token=discord_token,
+        openai_key=openai_key,
+        tester_channel_id=tester_channel_id,
+        supabase_url=supabase_url,
+        thread_pool_size=thread_pool_size,
+        llm_max_inflight=llm_max_inflight,
+    )
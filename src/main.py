@@ -1,16 +1,16 @@
 from botcore.bot import MyBot
-from config.manager import ConfigManager
+from config.manager import get_config
 
 
 def main():
-    config = ConfigManager()
+    config = get_config()
     try:
-        token = config.get_discord_token()
+        token = config.discord_token
         if not token:
             raise ValueError("Discord token not found.")
 
         bot = MyBot(command_prefix="!")
-        bot.run(token)
+        bot.run(token, root_logger=True)
     except Exception as e:
         print(f"Startup error: {e}")
 
@@ -2,7 +2,7 @@ from urllib.parse import unquote
 
 import asyncpg
 
-from config.manager import ConfigManager
+from config.manager import get_config
 
 
 def parse_pooler_dsn(dsn: str) -> dict:
@@ -58,7 +58,7 @@ class GifService:
         if self._initialized:
             return
 
-        self.config = ConfigManager()
+        self.config = get_config()
         self._pool: asyncpg.Pool | None = None
         self._initialized = True
 
@@ -66,7 +66,7 @@ class GifService:
         if self._pool is not None:
             return self._pool
 
-        supabase_url = self.config.get_supabase_url()
+        supabase_url = self.config.supabase_url
         if not supabase_url:
             raise RuntimeError(
                 "SUPABASE_URL is not configured. Set it in your .env file."
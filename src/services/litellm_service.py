@@ -1,8 +1,30 @@
+import asyncio
 import time
+from collections import OrderedDict
 import discord
 from discord import Message
 from langchain_litellm import ChatLiteLLM
-from config.manager import ConfigManager
+from config.manager import get_config
+
+# Responses starting with this are error text; never cached or kept as history
+ERROR_PREFIX = "Sorry,"
+
+
+def _split_for_discord(text: str, limit: int = 1950) -> list[str]:
+    """Splits text into message-sized parts, preferring the last newline in each window."""
+    parts = []
+    start = 0
+    while len(text) - start > limit:
+        split_index = text.rfind("\n", start, start + limit)
+        if split_index == -1 or split_index - start < 1000:
+            split_index = start + limit
+        parts.append(text[start:split_index])
+        start = split_index
+        # Drop the newline(s) the split landed on, like the streaming path does
+        while start < len(text) and text[start] == "\n":
+            start += 1
+    parts.append(text[start:])
+    return parts
 
 
 class LiteLLMService:
@@ -18,8 +40,8 @@ class LiteLLMService:
         if self._initialized:
             return
 
-        self.config = ConfigManager()
-        self.openai_api_key = self.config.get_openai_key()
+        self.config = get_config()
+        self.openai_api_key = self.config.openai_key
         if not self.openai_api_key:
             raise ValueError("OpenAI API key is not configured.")
 
@@ -35,70 +57,111 @@ class LiteLLMService:
             model_kwargs={"timeout": 180},
         )
 
+        # Caps concurrent LLM streams so bursts queue here instead of tripping quota errors
+        self._inflight = asyncio.Semaphore(self.config.llm_max_inflight)
+
+        # Exact-match cache: (model, rendered prompt) -> full response text
+        self._response_cache: OrderedDict[tuple[str | None, str], str] = OrderedDict()
+        self.MAX_RESPONSE_CACHE = 1024
+
         self._initialized = True
 
     async def stream_to_discord(
-        self, messageable, llm, prompt_value, prefix: str = "", **kwargs
+        self,
+        messageable,
+        llm,
+        prompt_value,
+        prefix: str = "",
+        use_cache: bool = False,
+        **kwargs,
     ) -> tuple[str, list[Message]]:
         """
         Streams the LLM response to Discord, returning the full text and sent messages.
         Handles message character limits and API rate-limit delays organically.
+        With use_cache, identical prompts to the same model are answered from an LRU
+        cache, so repeats get the same reply; leave it off for conversational callers.
         """
-        full_text = ""
-        current_part = prefix
+        cache_key = None
+        if use_cache:
+            cache_key = (getattr(llm, "model", None), prompt_value.to_string())
+            cached_text = self._response_cache.get(cache_key)
+            if cached_text is not None:
+                self._response_cache.move_to_end(cache_key)
+                sent_messages = []
+                for part in _split_for_discord(prefix + cached_text):
+                    if part.strip():
+                        sent_messages.append(await messageable.reply(part, **kwargs))
+                return cached_text, sent_messages
+
+        full_text_parts: list[str] = []
+        # Text for the message being built; joined only when it is sent or edited
+        part_chunks: list[str] = [prefix]
+        part_len = len(prefix)
         sent_messages = []
         current_message = None
         last_edit_time = 0.0
         EDIT_DELAY = 1.25  # Safe edit delay for Discord rate limits
 
-        async for chunk in llm.astream(prompt_value):
-            text = chunk.content
-            if not text:
-                continue
-
-            full_text += text
-            current_part += text
-
-            # Prevent hitting the 2000 character limit by creating a new message at ~1950 characters
-            if len(current_part) > 1950:
-                # Try splitting cleanly near the end
-                split_index = current_part.rfind("\n", 0, 1950)
-                if split_index == -1 or split_index < 1000:
-                    split_index = 1950
-
-                chunk_to_send = current_part[:split_index]
-
-                if not current_message:
-                    current_message = await messageable.reply(chunk_to_send, **kwargs)
-                else:
-                    try:
-                        await current_message.edit(content=chunk_to_send)
-                    except discord.HTTPException:
-                        pass  # Rate limits/identical content triggers exception safely
-
-                if current_message not in sent_messages:
-                    sent_messages.append(current_message)
-
-                # Keep the remainder for the next text chunk
-                current_part = current_part[split_index:].lstrip("\n")
-                current_message = None
-                last_edit_time = time.time()
-                continue
-
-            # Update the message periodically
-            now = time.time()
-            if now - last_edit_time >= EDIT_DELAY:
-                display_text = current_part + " █"
-                if not current_message:
-                    current_message = await messageable.reply(display_text, **kwargs)
-                else:
-                    try:
-                        await current_message.edit(content=display_text)
-                    except discord.HTTPException:
-                        pass
-                last_edit_time = now
+        async with self._inflight:
+            async for chunk in llm.astream(prompt_value):
+                text = chunk.content
+                if not text:
+                    continue
+
+                full_text_parts.append(text)
+                part_chunks.append(text)
+                part_len += len(text)
+
+                # Prevent hitting the 2000 character limit by creating a new message at ~1950 characters
+                if part_len > 1950:
+                    current_part = "".join(part_chunks)
+                    # Try splitting cleanly near the end
+                    split_index = current_part.rfind("\n", 0, 1950)
+                    if split_index == -1 or split_index < 1000:
+                        split_index = 1950
+
+                    chunk_to_send = current_part[:split_index]
+
+                    if not current_message:
+                        current_message = await messageable.reply(
+                            chunk_to_send, **kwargs
+                        )
+                    else:
+                        try:
+                            await current_message.edit(content=chunk_to_send)
+                        except discord.HTTPException:
+                            pass  # Rate limits/identical content triggers exception safely
+
+                    if current_message not in sent_messages:
+                        sent_messages.append(current_message)
+
+                    # Keep the remainder for the next text chunk
+                    remainder = current_part[split_index:].lstrip("\n")
+                    part_chunks = [remainder]
+                    part_len = len(remainder)
+                    current_message = None
+                    last_edit_time = time.time()
+                    continue
+
+                # Update the message periodically
+                now = time.time()
+                if now - last_edit_time >= EDIT_DELAY:
+                    current_part = "".join(part_chunks)
+                    part_chunks = [current_part]
+                    display_text = current_part + " █"
+                    if not current_message:
+                        current_message = await messageable.reply(
+                            display_text, **kwargs
+                        )
+                    else:
+                        try:
+                            await current_message.edit(content=display_text)
+                        except discord.HTTPException:
+                            pass
+                    last_edit_time = now
 
         # Flush final stream state cleanly
+        current_part = "".join(part_chunks)
         if current_message:
             try:
                 final_text = current_part if current_part.strip() else " "
@@ -112,4 +175,14 @@ class LiteLLMService:
             current_message = await messageable.reply(current_part, **kwargs)
             sent_messages.append(current_message)
 
+        full_text = "".join(full_text_parts)
+        if (
+            cache_key is not None
+            and full_text
+            and not full_text.startswith(ERROR_PREFIX)
+        ):
+            self._response_cache[cache_key] = full_text
+            if len(self._response_cache) > self.MAX_RESPONSE_CACHE:
+                self._response_cache.popitem(last=False)
+
         return full_text, sent_messages